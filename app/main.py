@@ -1,83 +1,426 @@
 import os
-import json
+import gzip
 import time
+import queue
+import atexit
+import itertools
+import hashlib
+import threading
+from collections import deque
 from datetime import datetime
-from flask import Flask, jsonify, request, render_template_string
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from cachetools import LRUCache, TTLCache
+from markupsafe import Markup, escape
 
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 MODEL_NAME = os.getenv("MODEL_NAME", "llama3.2:3b")
 PORT = int(os.environ.get("PORT", 5000))
 
+# Shared HTTP session so connections to Ollama are kept alive and reused
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        # Retry POSTs too: a 5xx from a busy Ollama means nothing was generated.
+        # Never retry read errors/timeouts, which would resend a generation
+        # Ollama may still be working on
+        read=False,
+        allowed_methods=None,
+        raise_on_status=False,
+    ),
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps(self, obj, **kwargs):
+        try:
+            return orjson.dumps(obj, default=self.default).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, which stdlib json handles
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
-# Storage for conversations
-CONVERSATIONS_FILE = "/data/conversations.json"
+# Storage for conversations (append-only JSON Lines, one record per line)
+CONVERSATIONS_FILE = "/data/conversations.jsonl"
+LEGACY_CONVERSATIONS_FILE = "/data/conversations.json"
 DATA_DIR = "/data"
 
+# Keep only the last 100 conversations; the log is compacted once it
+# holds more than twice that many lines
+MAX_CONVERSATIONS = 100
+COMPACT_THRESHOLD = 2 * MAX_CONVERSATIONS
+
 # Ensure data directory exists
 os.makedirs(DATA_DIR, exist_ok=True)
 
-def load_conversations():
-    """Load conversations from file"""
+def tail_jsonl(path, n, chunk_size=4096):
+    """Return the last n records of a JSON Lines file, oldest first.
+
+    The file is read backwards in chunks with os.pread, so only the lines
+    that are returned get parsed."""
+    records = []
     try:
-        if os.path.exists(CONVERSATIONS_FILE):
-            with open(CONVERSATIONS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return records
+    try:
+        end = os.fstat(fd).st_size
+        partial = b""
+        while end > 0 and len(records) < n:
+            start = max(0, end - chunk_size)
+            lines = (os.pread(fd, end - start, start) + partial).split(b"\n")
+            end = start
+            # The first piece may continue in the previous chunk
+            partial = lines.pop(0) if end > 0 else b""
+            for line in reversed(lines):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    # A line torn by a crash mid-append; skip it rather
+                    # than dropping everything before it
+                    print(f"⚠️  Skipping unreadable line in {path}")
+                    continue
+                if len(records) == n:
+                    break
     except Exception as e:
         print(f"⚠️  Error loading conversations: {e}")
-    return []
+    finally:
+        os.close(fd)
+    records.reverse()
+    return records
+
+def recent_conversations():
+    """Return the retained (last 100) conversations as a list"""
+    return tail_jsonl(CONVERSATIONS_FILE, MAX_CONVERSATIONS)
 
-def save_conversations(conversations):
-    """Save conversations to file"""
+def count_lines():
+    """Count records in the log without parsing them"""
     try:
-        with open(CONVERSATIONS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(conversations, f, indent=2, ensure_ascii=False)
-        return True
-    except Exception as e:
+        with open(CONVERSATIONS_FILE, 'rb') as f:
+            return sum(1 for line in f if line.strip())
+    except FileNotFoundError:
+        return 0
+
+def append_conversations(records):
+    """Append conversations to the log with a single write and fsync.
+
+    A failed append is rolled back, so retrying it cannot duplicate
+    records or leave a partial line behind."""
+    data = b"".join(orjson.dumps(record) + b"\n" for record in records)
+    try:
+        fd = os.open(CONVERSATIONS_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    except OSError as e:
         print(f"❌ Error saving conversations: {e}")
         return False
+    try:
+        start = os.fstat(fd).st_size
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        except OSError as e:
+            print(f"❌ Error saving conversations: {e}")
+            try:
+                os.ftruncate(fd, start)
+            except OSError:
+                pass
+            return False
+        return True
+    finally:
+        os.close(fd)
 
-def add_conversation(prompt, response, model_name):
-    """Add a new conversation to storage"""
-    conversations = load_conversations()
-    
-    conversation = {
-        "id": len(conversations) + 1,
-        "timestamp": datetime.now().isoformat(),
-        "prompt": prompt,
-        "response": response,
-        "model": model_name,
-        "response_length": len(response)
-    }
-    
+def compact_conversations():
+    """Rewrite the log keeping only the last 100 conversations"""
+    tmp = CONVERSATIONS_FILE + ".tmp"
+    try:
+        with open(tmp, 'wb', buffering=1 << 16) as f:
+            f.write(b"".join(orjson.dumps(conv) + b"\n" for conv in recent_conversations()))
+            f.flush()
+            os.fsync(f.fileno())
+        # Atomic swap: readers and a crash see either the old log or the new one
+        os.replace(tmp, CONVERSATIONS_FILE)
+        dir_fd = os.open(DATA_DIR, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+        print(f"🗜️  Compacted conversation log to {MAX_CONVERSATIONS} entries")
+    except Exception as e:
+        print(f"❌ Error compacting conversations: {e}")
+
+def migrate_legacy_conversations():
+    """Convert a pre-JSONL conversations.json into the append-only log"""
+    if os.path.exists(CONVERSATIONS_FILE) or not os.path.exists(LEGACY_CONVERSATIONS_FILE):
+        return
+    try:
+        with open(LEGACY_CONVERSATIONS_FILE, 'rb') as f:
+            conversations = orjson.loads(f.read())
+        append_conversations(conversations[-MAX_CONVERSATIONS:])
+        print(f"📦 Migrated {len(conversations)} conversations to {CONVERSATIONS_FILE}")
+    except Exception as e:
+        print(f"⚠️  Error migrating legacy conversations: {e}")
+
+def repair_conversation_log():
+    """Drop a partial last line left by a crash mid-append, so the next
+    append starts on a fresh line"""
+    try:
+        with open(CONVERSATIONS_FILE, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if not size:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            # Walk back to the last complete line
+            end = size
+            while end > 0:
+                start = max(0, end - 4096)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline != -1:
+                    end = start + newline + 1
+                    break
+                end = start
+            f.truncate(end)
+            print(f"🩹 Dropped {size - end} bytes of a partial record from {CONVERSATIONS_FILE}")
+    except FileNotFoundError:
+        pass
+
+migrate_legacy_conversations()
+repair_conversation_log()
+
+# In-memory conversation store, loaded from the log once at startup and
+# the source of truth afterwards; the log is only appended to. The deque
+# drops the oldest conversation by itself once 100 are held. "version" is
+# bumped on every change and keys everything derived from the store.
+_CACHE = {"conversations": deque(maxlen=MAX_CONVERSATIONS), "by_id": {}, "version": 0}
+_CACHE_LOCK = threading.Lock()
+
+def _store_conversation(conversation):
+    """Append to the ring buffer and keep the id index in step (caller holds the lock)"""
+    conversations = _CACHE["conversations"]
+    if len(conversations) == conversations.maxlen:
+        del _CACHE["by_id"][conversations[0]["id"]]
     conversations.append(conversation)
+    _CACHE["by_id"][conversation["id"]] = conversation
+    _CACHE["version"] += 1
+
+def _conversation_count():
+    with _CACHE_LOCK:
+        return len(_CACHE["conversations"])
+
+def _get_conversation(conversation_id):
+    with _CACHE_LOCK:
+        return _CACHE["by_id"].get(conversation_id)
+
+def _get_conversations_page(offset, limit):
+    """Return (version, total, page) for a slice of the history, oldest first"""
+    with _CACHE_LOCK:
+        conversations = _CACHE["conversations"]
+        page = list(itertools.islice(conversations, offset, offset + limit))
+        return _CACHE["version"], len(conversations), page
+
+def _get_latest_conversations(n):
+    """Return (version, total, latest) with the last n conversations, newest first"""
+    with _CACHE_LOCK:
+        conversations = _CACHE["conversations"]
+        latest = list(itertools.islice(reversed(conversations), n))
+        return _CACHE["version"], len(conversations), latest
+
+for _conv in recent_conversations():
+    _store_conversation(_conv)
+
+# IDs are handed out from a counter seeded from the last logged record and
+# are never reassigned
+_NEXT_ID = itertools.count(_CACHE["conversations"][-1]["id"] + 1 if _CACHE["conversations"] else 1)
+
+# Conversations waiting to be appended by the background writer
+_WRITE_QUEUE = queue.Queue()
+WRITE_BATCH_SIZE = 64
+
+WRITE_RETRIES = 5
+
+def _conversation_writer():
+    """Drain queued conversations to the log, one write + fsync per batch"""
+    lines = None
+    while True:
+        batch = [_WRITE_QUEUE.get()]
+        while len(batch) < WRITE_BATCH_SIZE:
+            try:
+                batch.append(_WRITE_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+        
+        try:
+            # Keep a failed batch and retry it with backoff before giving up
+            written = 0
+            for attempt in range(WRITE_RETRIES):
+                if append_conversations(batch):
+                    print(f"💾 Saved {len(batch)} conversation(s) up to #{batch[-1]['id']}")
+                    written = len(batch)
+                    break
+                time.sleep(0.5 * 2 ** attempt)
+            else:
+                print(f"❌ DROPPED {len(batch)} conversation(s) "
+                      f"#{batch[0]['id']}-#{batch[-1]['id']} after {WRITE_RETRIES} failed writes; "
+                      f"they will be missing after a restart")
+            
+            lines = count_lines() if lines is None else lines + written
+            if lines > COMPACT_THRESHOLD:
+                compact_conversations()
+                lines = count_lines()
+        except Exception as e:
+            # Never let one bad batch end the writer; recount on the next one
+            print(f"❌ Conversation writer error: {e}")
+            lines = None
+        finally:
+            for _ in batch:
+                _WRITE_QUEUE.task_done()
+
+def flush_conversations():
+    """Block until every queued conversation has been written"""
+    _WRITE_QUEUE.join()
+
+threading.Thread(target=_conversation_writer, name="conversation-writer", daemon=True).start()
+atexit.register(flush_conversations)
+
+def add_conversation(prompt, response, model_name):
+    """Add a new conversation; the disk write happens on the writer thread"""
+    with _CACHE_LOCK:
+        conversation = {
+            "id": next(_NEXT_ID),
+            "timestamp": datetime.now().isoformat(),
+            "prompt": prompt,
+            "response": response,
+            "model": model_name,
+            "response_length": len(response)
+        }
+        
+        # Publish to readers right away; queue under the lock so records
+        # reach the log in ID order
+        _store_conversation(conversation)
+        _WRITE_QUEUE.put_nowait(conversation)
     
-    # Keep only last 100 conversations to prevent file from growing too large
-    if len(conversations) > 100:
-        conversations = conversations[-100:]
-        # Reassign IDs
-        for i, conv in enumerate(conversations):
-            conv["id"] = i + 1
-    
-    if save_conversations(conversations):
-        print(f"💾 Saved conversation #{conversation['id']}")
-        return conversation
-    else:
-        print("❌ Failed to save conversation")
-        return None
+    print(f"📝 Queued conversation #{conversation['id']}")
+    return conversation
+
+# Bodies at least this large are gzip-compressed for clients that accept it
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 5
+
+def _accepts_gzip():
+    return request.accept_encodings["gzip"] > 0
+
+def _encoded_response(body, mimetype, gzipped):
+    """Wrap a pre-encoded body, marking it as gzip-encoded when it is"""
+    response = Response(body, mimetype=mimetype)
+    response.vary.add("Accept-Encoding")
+    if gzipped:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+# /health only varies in the conversation count, so the body is encoded
+# once around a placeholder and the count is spliced in per request
+_HEALTH_HEAD, _HEALTH_TAIL = orjson.dumps({
+    "status": "healthy",
+    "service": "Basic Local AI",
+    "model": MODEL_NAME,
+    "total_conversations": "__TOTAL__",
+    "storage_file": CONVERSATIONS_FILE
+}).split(b'"__TOTAL__"')
 
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    conversations = load_conversations()
-    return jsonify({
-        "status": "healthy",
-        "service": "Basic Local AI",
+    body = b"%s%d%s" % (_HEALTH_HEAD, _conversation_count(), _HEALTH_TAIL)
+    return Response(body, mimetype="application/json")
+
+# Recently generated responses, keyed on (model, prompt); repeated prompts
+# are answered without another round-trip to Ollama
+_RESPONSE_CACHE = TTLCache(maxsize=256, ttl=3600)
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+# blake2b keyed per model (keys are capped at 64 bytes, so the model name
+# is hashed down to one); used for response-cache keys and ETags
+_HASH_KEY = hashlib.blake2b(MODEL_NAME.encode('utf-8'), digest_size=32).digest()
+
+def _content_hash(data):
+    return hashlib.blake2b(data, digest_size=16, key=_HASH_KEY).digest()
+
+def _response_cache_key(prompt):
+    return _content_hash(prompt.encode('utf-8'))
+
+def _finish_generation(prompt, cache_key, generated_text, cached):
+    """Cache and store a completed generation, returning the response body"""
+    if not cached:
+        print(f"✅ Text generated successfully ({len(generated_text)} chars)")
+        # An empty reply is not worth replaying for an hour
+        if generated_text:
+            with _RESPONSE_CACHE_LOCK:
+                _RESPONSE_CACHE[cache_key] = generated_text
+    
+    # Store the conversation
+    conversation = add_conversation(prompt, generated_text, MODEL_NAME)
+    
+    return {
+        "status": "success",
+        "generated_text": generated_text,
         "model": MODEL_NAME,
-        "total_conversations": len(conversations),
-        "storage_file": CONVERSATIONS_FILE
-    })
+        "conversation_id": conversation["id"] if conversation else None,
+        "cached": cached
+    }
+
+def _sse(event):
+    return b"data: " + orjson.dumps(event) + b"\n\n"
+
+def _stream_events(prompt, cache_key, response):
+    """Relay Ollama's streamed chunks as server-sent events"""
+    pieces = []
+    try:
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = orjson.loads(line)
+            piece = chunk.get("response", "")
+            if piece:
+                pieces.append(piece)
+                yield _sse({"response": piece})
+            if chunk.get("done"):
+                break
+        else:
+            raise RuntimeError("Ollama stream ended before completion")
+        
+        result = _finish_generation(prompt, cache_key, "".join(pieces).strip(), False)
+        yield _sse({"done": True, **result})
+    except Exception as e:
+        print(f"❌ Error streaming text: {e}")
+        yield _sse({"done": True, "status": "error", "message": str(e)})
+    finally:
+        response.close()
+
+def _stream_response(events):
+    return Response(events, mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache"})
 
 @app.route('/generate', methods=['POST'])
 def generate_text():
@@ -85,6 +428,22 @@ def generate_text():
     try:
         data = request.get_json() or {}
         prompt = data.get('prompt', 'Hello, how are you?')
+        # Stream tokens back as server-sent events when the client asks
+        stream = bool(data.get('stream'))
+        
+        cache_key = _response_cache_key(prompt)
+        with _RESPONSE_CACHE_LOCK:
+            generated_text = _RESPONSE_CACHE.get(cache_key)
+        
+        if generated_text is not None:
+            print(f"⚡ Cache hit for prompt: {prompt[:50]}...")
+            result = _finish_generation(prompt, cache_key, generated_text, True)
+            if stream:
+                return _stream_response(iter([
+                    _sse({"response": generated_text}),
+                    _sse({"done": True, **result}),
+                ]))
+            return jsonify(result)
         
         print(f"🤖 Generating text with prompt: {prompt[:50]}...")
         
@@ -93,34 +452,27 @@ def generate_text():
         payload = {
             "model": MODEL_NAME,
             "prompt": prompt,
-            "stream": False,
+            "stream": stream,
             "options": {
                 "temperature": 0.7,
             },
         }
         
-        response = requests.post(url, json=payload, timeout=180)
+        response = SESSION.post(url, json=payload, stream=stream, timeout=(3.05, 180))
         
-        if response.status_code == 200:
-            result = response.json()
-            generated_text = result.get("response", "").strip()
-            
-            print(f"✅ Text generated successfully ({len(generated_text)} chars)")
-            
-            # Store the conversation
-            conversation = add_conversation(prompt, generated_text, MODEL_NAME)
-            
-            return jsonify({
-                "status": "success",
-                "generated_text": generated_text,
-                "model": MODEL_NAME,
-                "conversation_id": conversation["id"] if conversation else None
-            })
-        else:
+        if response.status_code != 200:
+            response.close()
             return jsonify({
                 "status": "error",
                 "message": f"Ollama API error: {response.status_code}"
             }), 500
+        
+        if stream:
+            return _stream_response(_stream_events(prompt, cache_key, response))
+        
+        result = response.json()
+        generated_text = result.get("response", "").strip()
+        return jsonify(_finish_generation(prompt, cache_key, generated_text, False))
             
     except Exception as e:
         print(f"❌ Error generating text: {e}")
@@ -129,181 +481,211 @@ def generate_text():
             "message": str(e)
         }), 500
 
+_GENERATE_INFO_BODY = orjson.dumps({
+    "status": "info",
+    "message": "Use POST /generate with JSON body: {\"prompt\": \"your text here\"} (add \"stream\": true for server-sent events)",
+    "endpoints": {
+        "POST /generate": "Generate text from prompt",
+        "GET /generate": "This help message",
+        "GET /health": "Health check",
+        "GET /conversations": "View conversation history",
+        "GET /": "Web interface"
+    }
+})
+
 @app.route('/generate', methods=['GET'])
 def generate_info():
     """Show generation endpoint info"""
-    return jsonify({
-        "status": "info",
-        "message": "Use POST /generate with JSON body: {\"prompt\": \"your text here\"}",
-        "endpoints": {
-            "POST /generate": "Generate text from prompt",
-            "GET /generate": "This help message",
-            "GET /health": "Health check",
-            "GET /conversations": "View conversation history",
-            "GET /": "Web interface"
-        }
-    })
+    return Response(_GENERATE_INFO_BODY, mimetype="application/json")
+
+# Serialized /conversations pages keyed on (offset, limit, pretty), each
+# with its ETag and (lazily) its gzip encoding; valid for one store version
+_PAGE_CACHE = {"version": None, "pages": LRUCache(maxsize=64)}
+_PAGE_CACHE_LOCK = threading.Lock()
 
 @app.route('/conversations', methods=['GET'])
 def get_conversations():
     """Get conversation history"""
-    conversations = load_conversations()
-    
     # Support filtering and pagination
     limit = request.args.get('limit', type=int, default=20)
     offset = request.args.get('offset', type=int, default=0)
+    # Compact JSON by default; ?pretty=1 indents it for humans
+    pretty = request.args.get('pretty', type=int, default=0) == 1
     
-    # Apply pagination
-    paginated_conversations = conversations[offset:offset + limit]
+    if limit < 0 or offset < 0:
+        return jsonify({
+            "status": "error",
+            "message": "limit and offset must not be negative"
+        }), 400
     
-    return jsonify({
-        "status": "success",
-        "total": len(conversations),
-        "limit": limit,
-        "offset": offset,
-        "conversations": paginated_conversations
-    })
+    # Nothing lies beyond the ring buffer; bounding both keeps islice (and
+    # the echoed values) within machine-size integers
+    limit = min(limit, MAX_CONVERSATIONS)
+    offset = min(offset, MAX_CONVERSATIONS)
+    
+    key = (offset, limit, pretty)
+    version = _CACHE["version"]
+    with _PAGE_CACHE_LOCK:
+        if _PAGE_CACHE["version"] != version:
+            _PAGE_CACHE["pages"].clear()
+            _PAGE_CACHE["version"] = version
+        page = _PAGE_CACHE["pages"].get(key)
+    
+    if page is None:
+        # Apply pagination
+        version, total, paginated_conversations = _get_conversations_page(offset, limit)
+        
+        body = orjson.dumps({
+            "status": "success",
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "conversations": paginated_conversations
+        }, option=orjson.OPT_INDENT_2 if pretty else 0)
+        page = {"body": body, "etag": _content_hash(body).hex(), "gzip": None}
+        with _PAGE_CACHE_LOCK:
+            if _PAGE_CACHE["version"] == version:
+                _PAGE_CACHE["pages"][key] = page
+    
+    gzipped = len(page["body"]) >= COMPRESS_MIN_SIZE and _accepts_gzip()
+    if gzipped and page["gzip"] is None:
+        page["gzip"] = gzip.compress(page["body"], compresslevel=COMPRESS_LEVEL)
+    
+    response = _encoded_response(page["gzip"] if gzipped else page["body"],
+                                 "application/json", gzipped)
+    # Weak, since the same ETag covers the plain and gzip encodings
+    response.set_etag(page["etag"], weak=True)
+    return response.make_conditional(request)
 
 @app.route('/conversations/<int:conversation_id>', methods=['GET'])
 def get_conversation(conversation_id):
     """Get a specific conversation by ID"""
-    conversations = load_conversations()
+    conv = _get_conversation(conversation_id)
     
-    for conv in conversations:
-        if conv["id"] == conversation_id:
-            return jsonify({
-                "status": "success",
-                "conversation": conv
-            })
+    if conv is not None:
+        return jsonify({
+            "status": "success",
+            "conversation": conv
+        })
     
     return jsonify({
         "status": "error",
         "message": f"Conversation #{conversation_id} not found"
     }), 404
 
-@app.route('/', methods=['GET'])
-def web_interface():
-    """Basic web interface for the AI service"""
-    conversations = load_conversations()
-    
-    html_template = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Basic Local AI</title>
-        <meta charset="utf-8">
-        <style>
-            body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
-            .container { max-width: 1200px; margin: 0 auto; }
-            .header { background: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-            .input-section { background: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-            .conversations-section { background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-            input[type="text"] { width: 70%; padding: 10px; border: 1px solid #ddd; border-radius: 4px; margin-right: 10px; }
-            button { padding: 10px 20px; background: #007bff; color: white; border: none; border-radius: 4px; cursor: pointer; }
-            button:hover { background: #0056b3; }
-            .conversation { border: 1px solid #ddd; margin: 10px 0; padding: 15px; border-radius: 4px; background: #f9f9f9; }
-            .prompt { background: #e3f2fd; padding: 10px; border-radius: 4px; margin-bottom: 10px; }
-            .response { background: #f1f8e9; padding: 10px; border-radius: 4px; }
-            .metadata { font-size: 12px; color: #666; margin-top: 10px; }
-            .loading { display: none; color: #666; }
-            .error { color: #d32f2f; background: #ffebee; padding: 10px; border-radius: 4px; margin: 10px 0; }
-            .success { color: #388e3c; background: #e8f5e8; padding: 10px; border-radius: 4px; margin: 10px 0; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🤖 Basic Local AI</h1>
-                <p>Local AI text generation service using Ollama</p>
-                <p><strong>Model:</strong> {{ model_name }} | <strong>Total Conversations:</strong> {{ total_conversations }}</p>
-            </div>
-            
-            <div class="input-section">
-                <h3>Generate Text</h3>
-                <input type="text" id="promptInput" placeholder="Enter your prompt here..." value="Hello, how are you?">
-                <button onclick="generateText()">Generate</button>
-                <div class="loading" id="loading">Generating text...</div>
-                <div id="result"></div>
-            </div>
-            
-            <div class="conversations-section">
-                <h3>Recent Conversations</h3>
-                {% if conversations %}
-                    {% for conv in conversations[-10:]|reverse %}
-                    <div class="conversation">
-                        <div class="prompt"><strong>Prompt:</strong> {{ conv.prompt }}</div>
-                        <div class="response"><strong>Response:</strong> {{ conv.response }}</div>
-                        <div class="metadata">
-                            ID: #{{ conv.id }} | Model: {{ conv.model }} | 
-                            Length: {{ conv.response_length }} chars | 
-                            Time: {{ conv.timestamp[:19].replace('T', ' ') }}
-                        </div>
-                    </div>
-                    {% endfor %}
-                {% else %}
-                    <p>No conversations yet. Generate some text to get started!</p>
-                {% endif %}
-            </div>
+HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Basic Local AI</title>
+    <meta charset="utf-8">
+    <link rel="stylesheet" href="/static/ui.css?v={{ asset_version }}">
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🤖 Basic Local AI</h1>
+            <p>Local AI text generation service using Ollama</p>
+            <p><strong>Model:</strong> {{ model_name }} | <strong>Total Conversations:</strong> {{ total_conversations }}</p>
         </div>
         
-        <script>
-            async function generateText() {
-                const prompt = document.getElementById('promptInput').value;
-                const loading = document.getElementById('loading');
-                const result = document.getElementById('result');
-                
-                if (!prompt.trim()) {
-                    result.innerHTML = '<div class="error">Please enter a prompt</div>';
-                    return;
-                }
-                
-                loading.style.display = 'block';
-                result.innerHTML = '';
-                
-                try {
-                    const response = await fetch('/generate', {
-                        method: 'POST',
-                        headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify({ prompt: prompt })
-                    });
-                    
-                    const data = await response.json();
-                    
-                    if (data.status === 'success') {
-                        result.innerHTML = `
-                            <div class="success">
-                                <strong>Generated Text:</strong><br>
-                                ${data.generated_text.replace(/\\n/g, '<br>')}<br><br>
-                                <small>Conversation ID: #${data.conversation_id}</small>
-                            </div>
-                        `;
-                        // Reload page to show new conversation
-                        setTimeout(() => location.reload(), 2000);
-                    } else {
-                        result.innerHTML = `<div class="error">Error: ${data.message}</div>`;
-                    }
-                } catch (error) {
-                    result.innerHTML = `<div class="error">Error: ${error.message}</div>`;
-                } finally {
-                    loading.style.display = 'none';
-                }
-            }
-            
-            // Allow Enter key to submit
-            document.getElementById('promptInput').addEventListener('keypress', function(e) {
-                if (e.key === 'Enter') {
-                    generateText();
-                }
-            });
-        </script>
-    </body>
-    </html>
-    """
+        <div class="input-section">
+            <h3>Generate Text</h3>
+            <input type="text" id="promptInput" placeholder="Enter your prompt here..." value="Hello, how are you?">
+            <button onclick="generateText()">Generate</button>
+            <div class="loading" id="loading">Generating text...</div>
+            <div id="result"></div>
+        </div>
+        
+        <div class="conversations-section">
+            <h3>Recent Conversations</h3>
+            {% if conversations_html %}
+                {{ conversations_html }}
+            {% else %}
+                <p>No conversations yet. Generate some text to get started!</p>
+            {% endif %}
+        </div>
+    </div>
     
-    return render_template_string(html_template, 
-                                model_name=MODEL_NAME, 
-                                total_conversations=len(conversations),
-                                conversations=conversations)
+    <script src="/static/ui.js?v={{ asset_version }}" defer></script>
+</body>
+</html>
+"""
+
+CONVERSATION_HTML = """
+                <div class="conversation">
+                    <div class="prompt"><strong>Prompt:</strong> {prompt}</div>
+                    <div class="response"><strong>Response:</strong> {response}</div>
+                    <div class="metadata">
+                        ID: #{id} | Model: {model} | 
+                        Length: {response_length} chars | 
+                        Time: {time}
+                    </div>
+                </div>"""
+
+# Compiled once at import instead of on every request
+_INDEX_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+
+def _asset_version():
+    """Fingerprint of the static UI files, used to bust long-lived caches"""
+    digest = hashlib.blake2b(digest_size=6)
+    for name in ("ui.css", "ui.js"):
+        with open(os.path.join(app.static_folder, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+ASSET_VERSION = _asset_version()
+
+@app.after_request
+def cache_static_assets(response):
+    """Let browsers keep the fingerprinted UI assets for a year"""
+    if request.path.startswith('/static/') and response.status_code == 200:
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+# Rendered page (and its gzip encoding), rebuilt only when the store changes
+_RENDER_CACHE = {"version": None, "page": b"", "gzip": None}
+_RENDER_CACHE_LOCK = threading.Lock()
+
+def _render_recent_conversations(latest):
+    """Return the escaped HTML for the given conversations"""
+    return Markup("".join(
+        CONVERSATION_HTML.format(
+            prompt=escape(conv["prompt"]),
+            response=escape(conv["response"]),
+            id=escape(conv["id"]),
+            model=escape(conv["model"]),
+            response_length=escape(conv["response_length"]),
+            time=escape(conv["timestamp"][:19].replace('T', ' ')),
+        )
+        for conv in latest
+    ))
+
+def _render_index(gzipped):
+    """Return the index page bytes, rendering at most once per store version"""
+    with _RENDER_CACHE_LOCK:
+        if _RENDER_CACHE["version"] != _CACHE["version"]:
+            version, total, latest = _get_latest_conversations(10)
+            _RENDER_CACHE["page"] = _INDEX_TEMPLATE.render(
+                model_name=MODEL_NAME,
+                asset_version=ASSET_VERSION,
+                total_conversations=total,
+                conversations_html=_render_recent_conversations(latest),
+            ).encode('utf-8')
+            _RENDER_CACHE["gzip"] = None
+            _RENDER_CACHE["version"] = version
+        if not gzipped:
+            return _RENDER_CACHE["page"]
+        if _RENDER_CACHE["gzip"] is None:
+            _RENDER_CACHE["gzip"] = gzip.compress(_RENDER_CACHE["page"], compresslevel=COMPRESS_LEVEL)
+        return _RENDER_CACHE["gzip"]
+
+@app.route('/', methods=['GET'])
+def web_interface():
+    """Basic web interface for the AI service"""
+    # Pages are always well above COMPRESS_MIN_SIZE
+    gzipped = _accepts_gzip()
+    return _encoded_response(_render_index(gzipped), "text/html", gzipped)
 
 if __name__ == "__main__":
     print("🚀 Starting Basic Local AI...")
@@ -317,4 +699,6 @@ if __name__ == "__main__":
     print("   - GET /health - Health check")
     print()
     
-    app.run(host='0.0.0.0', port=PORT, debug=False)
+    # One thread per request: a long /generate (up to 180s) must not block
+    # /health or the read endpoints
+    app.run(host='0.0.0.0', port=PORT, debug=False, threaded=True)
@@ -0,0 +1,79 @@
+async function generateText() {
+    const prompt = document.getElementById('promptInput').value;
+    const loading = document.getElementById('loading');
+    const result = document.getElementById('result');
+
+    if (!prompt.trim()) {
+        result.innerHTML = '<div class="error">Please enter a prompt</div>';
+        return;
+    }
+
+    loading.style.display = 'block';
+    result.innerHTML = '';
+
+    try {
+        const response = await fetch('/generate', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ prompt: prompt, stream: true })
+        });
+
+        if (!response.ok) {
+            const data = await response.json();
+            result.innerHTML = `<div class="error">Error: ${data.message}</div>`;
+            return;
+        }
+
+        result.innerHTML = `
+            <div class="success">
+                <strong>Generated Text:</strong><br>
+                <span class="generated-text" id="generatedText"></span><br><br>
+                <small id="conversationId"></small>
+            </div>
+        `;
+        const output = document.getElementById('generatedText');
+
+        // Render server-sent events as they arrive
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let data = null;
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
+            for (const event of events) {
+                if (!event.startsWith('data: ')) continue;
+                const chunk = JSON.parse(event.slice(6));
+                if (chunk.response) {
+                    loading.style.display = 'none';
+                    output.textContent += chunk.response;
+                }
+                if (chunk.done) data = chunk;
+            }
+        }
+
+        if (data && data.status === 'success') {
+            output.textContent = data.generated_text;
+            document.getElementById('conversationId').textContent = `Conversation ID: #${data.conversation_id}`;
+            // Reload page to show new conversation
+            setTimeout(() => location.reload(), 2000);
+        } else {
+            result.innerHTML = `<div class="error">Error: ${data ? data.message : 'Stream ended unexpectedly'}</div>`;
+        }
+    } catch (error) {
+        result.innerHTML = `<div class="error">Error: ${error.message}</div>`;
+    } finally {
+        loading.style.display = 'none';
+    }
+}
+
+// Allow Enter key to submit
+document.getElementById('promptInput').addEventListener('keypress', function(e) {
+    if (e.key === 'Enter') {
+        generateText();
+    }
+});
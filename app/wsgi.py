@@ -0,0 +1,2 @@
+"""WSGI entrypoint for gunicorn: ``gunicorn wsgi:application``"""
+from main import app as application
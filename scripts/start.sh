@@ -75,10 +75,13 @@ check_app_api() {
 check_containers_need_rebuild() {
     echo "🔧 Checking if containers need rebuilding..."
     
-    # Check if we need to rebuild (if requirements.txt changed or code changed)
+    # Newest mtime of anything baked into the image (code, static UI files,
+    # requirements.txt, Dockerfile, wsgi.py)
+    app_mtime=$(find "$PROJECT_ROOT/app" -type f -not -path '*/__pycache__/*' -printf '%T@\n' 2>/dev/null | sort -n | tail -1 | cut -d. -f1)
+    
+    # Check if we need to rebuild (if anything under app/ changed)
     if [ ! -f "$PROJECT_ROOT/.last_build" ] || \
-       [ "$(stat -c %Y "$PROJECT_ROOT/app/requirements.txt" 2>/dev/null || echo 0)" -gt "$(cat "$PROJECT_ROOT/.last_build" 2>/dev/null || echo 0)" ] || \
-       [ "$(stat -c %Y "$PROJECT_ROOT/app/main.py" 2>/dev/null || echo 0)" -gt "$(cat "$PROJECT_ROOT/.last_build" 2>/dev/null || echo 0)" ] || \
+       [ "${app_mtime:-0}" -gt "$(cat "$PROJECT_ROOT/.last_build" 2>/dev/null || echo 0)" ] || \
        [ "$(stat -c %Y "$PROJECT_ROOT/docker-compose.yml" 2>/dev/null || echo 0)" -gt "$(cat "$PROJECT_ROOT/.last_build" 2>/dev/null || echo 0)" ]; then
         
         echo "📦 Code changes detected, rebuilding app container..."
@@ -321,15 +324,15 @@ run_basic_test() {
     
     # Check if data file was actually created locally
     echo "📁 Checking local data storage..."
-    if [ -f "$PROJECT_ROOT/data/conversations.json" ]; then
-        file_size=$(stat -c %s "$PROJECT_ROOT/data/conversations.json" 2>/dev/null || echo "unknown")
-        echo "✅ Local data file created: $PROJECT_ROOT/data/conversations.json ($file_size bytes)"
+    if [ -f "$PROJECT_ROOT/data/conversations.jsonl" ]; then
+        file_size=$(stat -c %s "$PROJECT_ROOT/data/conversations.jsonl" 2>/dev/null || echo "unknown")
+        echo "✅ Local data file created: $PROJECT_ROOT/data/conversations.jsonl ($file_size bytes)"
         
         # Show first few lines of the file
         echo "   📄 File contents preview:"
-        head -5 "$PROJECT_ROOT/data/conversations.json" | sed 's/^/      /'
+        head -5 "$PROJECT_ROOT/data/conversations.jsonl" | sed 's/^/      /'
     else
-        echo "❌ Local data file not found: $PROJECT_ROOT/data/conversations.json"
+        echo "❌ Local data file not found: $PROJECT_ROOT/data/conversations.jsonl"
         echo "   💡 This might be a Docker volume mounting issue"
         echo "   🔍 Checking Docker volume mounts..."
         docker inspect basic-ai-app | grep -A 10 "Mounts" || echo "   Could not inspect container mounts"
@@ -359,7 +362,7 @@ show_status() {
     docker ps --format "table {{.Names}}\t{{.Status}}\t{{.Ports}}"
     echo ""
     echo "💾 Data Storage:"
-    echo "   - Conversations: $PROJECT_ROOT/data/conversations.json"
+    echo "   - Conversations: $PROJECT_ROOT/data/conversations.jsonl"
     echo "   - Ollama models: $PROJECT_ROOT/ollama_data/"
     echo ""
     echo "📊 Usage:"
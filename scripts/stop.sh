@@ -22,7 +22,7 @@ echo ""
 echo "✅ Services stopped successfully!"
 echo ""
 echo "📊 What was preserved:"
-echo "   - Generated conversations in $PROJECT_ROOT/data/conversations.json"
+echo "   - Generated conversations in $PROJECT_ROOT/data/conversations.jsonl"
 echo "   - Ollama models and data in $PROJECT_ROOT/ollama_data/"
 echo "   - Docker images (for faster restart)"
 echo ""